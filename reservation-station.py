@@ -1,6 +1,16 @@
 import requests
+from requests.adapters import HTTPAdapter
+import orjson
 import pandas as pd
+import numpy as np
 import time
+import random
+import os
+import hashlib
+import threading
+import collections
+import io
+import base64
 from datetime import datetime, timedelta
 import pytz
 import dash
@@ -17,7 +27,9 @@ HEADERS = {
 
 NY_TZ = pytz.timezone("America/New_York")
 MAX_RETRIES = 3  # Number of retries for failed requests
-RETRY_DELAY = (2, 5)  # Min and max seconds to wait before retrying
+FALLBACK_IMAGE = 'https://img.freepik.com/premium-vector/cartoon-orange_24381-186.jpg'  # Venues without photos
+MAX_PAGES = 10  # Pages of 100 venues fetched per query (per batch when BATCH_CUISINES is set)
+MAX_RETRY_DELAY = 60  # Cap in seconds for exponential backoff between retries
 
 # Cuisine types to query separately
 CUISINES = [
@@ -26,15 +38,238 @@ CUISINES = [
     "Seafood", "Steakhouse", "Sushi", "Thai"
 ]
 
+# Shared HTTP session so keep-alive connections are reused across pages and worker threads
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0))
+
+class TokenBucket:
+    """Thread-safe token bucket that paces requests to a fixed requests-per-minute rate."""
+
+    def __init__(self, rpm, burst=1):
+        self.rpm = rpm
+        self.burst = burst  # Bucket capacity; kept small so pacing applies from the first request
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` are available, then consume them."""
+        if tokens > self.burst:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket with burst {self.burst}")
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                elapsed = now - self.last_refill
+                self.tokens = min(self.burst, self.tokens + elapsed * self.rpm / 60)
+                self.last_refill = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) * 60 / self.rpm
+
+            time.sleep(wait)  # Sleep outside the lock so other threads can refill/check
+
+BUCKET = TokenBucket(rpm=120, burst=5)  # Shared across all worker threads
+
+# Shared pool for fetching pages 2..N of each cuisine in parallel; BUCKET still caps the overall rate
+PAGE_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=16)
+
+def env_int(name, default, minimum):
+    """Read an integer setting from the environment, falling back to the default if it's invalid."""
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        print(f"⚠️ Invalid {name}={raw!r}; using {default}.")
+        return default
+    if value < minimum:
+        print(f"⚠️ {name}={value} is below {minimum}; using {minimum}.")
+        return minimum
+    return value
+
+def env_choice(name, default, choices):
+    """Read a setting from the environment that must be one of `choices`, falling back to the default."""
+    value = os.environ.get(name, default)
+    if value not in choices:
+        print(f"⚠️ Invalid {name}={value!r} (expected one of {', '.join(choices)}); using {default}.")
+        return default
+    return value
+
+# Worker threads for the cuisine pool. Empirically 4-6 is the sweet spot: more workers
+# mostly trigger 502s/429s, and dropping from 10 to 5 improved tail latency.
+DEFAULT_CONCURRENCY = env_int("RESY_CONCURRENCY", 4, minimum=1)
+
+# Rolling window of recent request durations (seconds) used to tune concurrency
+REQUEST_DURATIONS = collections.deque(maxlen=256)
+
+def post_search(url, payload):
+    """POST a search request through the shared session with rate limiting and latency tracking."""
+    BUCKET.acquire(1)
+    start = time.perf_counter()
+    try:
+        return SESSION.post(url, json=payload, headers=HEADERS, timeout=10)
+    finally:
+        REQUEST_DURATIONS.append(time.perf_counter() - start)
+
+def log_request_latency():
+    """Print p50/p95 of recent request durations so the operator can tune RESY_CONCURRENCY."""
+    durations = sorted(REQUEST_DURATIONS)
+    if not durations:
+        return
+    p50 = durations[int(0.50 * (len(durations) - 1))]
+    p95 = durations[int(0.95 * (len(durations) - 1))]
+    print(f"⏱️ Request latency over last {len(durations)} calls: p50={p50:.3f}s p95={p95:.3f}s")
+
+# Cuisines per search request: 0 queries each cuisine separately, N sends them in groups
+# of N via a list-valued cuisine filter (>= len(CUISINES) means a single request)
+CUISINE_BATCH_SIZE = env_int("BATCH_CUISINES", 0, minimum=0)
+
 # Search area covering Manhattan
 MANHATTAN_CENTER = {"latitude": 40.712941, "longitude": -74.006393, "radius": 35420}
 
-def fetch_cuisine_reservations(cuisine, day, party_size, target_time):
-    """Fetch reservations for a specific cuisine with retry logic."""
+# Columns of the reservations frame, in display order
+RESERVATION_COLUMNS = [
+    "Venue Name", "Neighborhood", "Rating", "Total Ratings", "Price Range", "Cuisine Type",
+    "Date", "Time (NYC)", "Table Size", "Dining Type", "Reservation Link",
+    "Latitude", "Longitude", "Icon Image"
+]
+
+# On-disk response cache
+CACHE_DIR = "cache"
+CACHE_METADATA = os.path.join(CACHE_DIR, "metadata.parquet")
+CACHE_TTL_TODAY = timedelta(hours=1)  # Same-day availability changes quickly
+CACHE_TTL_FUTURE = timedelta(hours=24)
+CACHE_MODE = env_choice("RESY_CACHE_MODE", "enabled", ("enabled", "replay", "disabled"))
+CACHE_LOCK = threading.Lock()  # Guards metadata.parquet across worker threads
+
+def backoff_delay(attempt, response=None):
+    """Exponential backoff with jitter, honoring Retry-After when the server sends one."""
+    delay = min(MAX_RETRY_DELAY, 2 ** attempt + random.uniform(0, 1))
+    if response is not None:
+        try:
+            delay = max(0.0, min(MAX_RETRY_DELAY, float(response.headers.get('Retry-After', delay))))
+        except ValueError:
+            pass  # Retry-After given as an HTTP date; keep the computed delay
+    return delay
+
+def cache_key(cuisine, day, party_size, target_time):
+    """Build the cache key for a single cuisine (or cuisine batch) search."""
+    if not isinstance(cuisine, str):
+        cuisine = ",".join(cuisine)
+    return hashlib.sha256(f"{cuisine}|{day}|{party_size}|{target_time}".encode()).hexdigest()
+
+def cache_ttl(day):
+    """Return how long cached results for a search day stay fresh."""
+    today = datetime.now(NY_TZ).strftime("%Y-%m-%d")
+    return CACHE_TTL_TODAY if day == today else CACHE_TTL_FUTURE
+
+def read_cache_metadata():
+    """Read metadata.parquet, returning None if it is missing or unreadable (callers hold CACHE_LOCK)."""
+    if not os.path.exists(CACHE_METADATA):
+        return None
+    try:
+        return pd.read_parquet(CACHE_METADATA, columns=["key", "day", "created_at"])
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Ignoring unreadable cache metadata: {e}")
+        return None
+
+def write_parquet_atomic(df, path):
+    """Write a frame to a temp file and rename it into place so readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def load_cached_reservations(key, day, cache_mode):
+    """Return cached reservations for a key, or None on a miss or expired entry."""
+    path = os.path.join(CACHE_DIR, f"{key}.parquet")
+    if cache_mode == "disabled" or not os.path.exists(path):
+        return None
+
+    if cache_mode != "replay":  # Replay ignores TTL so searches can run fully offline
+        with CACHE_LOCK:
+            metadata = read_cache_metadata()
+        if metadata is None:
+            return None
+        created = metadata.loc[metadata["key"] == key, "created_at"]
+        if created.empty:
+            return None
+
+        if pd.Timestamp.now(tz="UTC") - created.iloc[-1] > cache_ttl(day):
+            return None
+
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Ignoring unreadable cache entry {key[:8]}: {e}")
+        return None
+
+def store_cached_reservations(key, day, reservations):
+    """Write reservations for a key to disk, stamp its creation time and prune expired entries."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        write_parquet_atomic(reservations, os.path.join(CACHE_DIR, f"{key}.parquet"))
+    except (OSError, ValueError, TypeError) as e:
+        print(f"⚠️ Could not write cache entry {key[:8]}: {e}")
+        return
+
+    with CACHE_LOCK:
+        now = pd.Timestamp.now(tz="UTC")
+        entry = pd.DataFrame({"key": [key], "day": [day], "created_at": [now]})
+        metadata = read_cache_metadata()
+        if metadata is not None:
+            metadata = metadata[metadata["key"] != key]
+
+            # Drop entries that are past their TTL or for days that have already gone by
+            today = datetime.now(NY_TZ).strftime("%Y-%m-%d")
+            ttls = metadata["day"].map(cache_ttl)
+            expired = (now - metadata["created_at"] > ttls) | (metadata["day"] < today)
+            for stale_key in metadata.loc[expired, "key"]:
+                try:
+                    os.remove(os.path.join(CACHE_DIR, f"{stale_key}.parquet"))
+                except OSError:
+                    pass  # Already gone
+            entry = pd.concat([metadata[~expired], entry], ignore_index=True)
+
+        try:
+            write_parquet_atomic(entry, CACHE_METADATA)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not write cache metadata: {e}")
+
+def format_slot_time(start):
+    """Format the time of a Resy 'YYYY-MM-DD HH:MM:SS' timestamp as 'HH:MM AM/PM' without parsing it."""
+    hour = int(start[11:13])
+    return f"{hour % 12 or 12:02d}:{start[14:16]} {'AM' if hour < 12 else 'PM'}"
+
+def empty_reservations():
+    """Return an empty reservations frame with the expected columns."""
+    return pd.DataFrame(columns=RESERVATION_COLUMNS)
+
+def fetch_cuisine_reservations(cuisine, day, party_size, target_time, cache_mode=CACHE_MODE):
+    """Fetch reservations for a specific cuisine (or list of cuisines) with retry logic."""
     url = "https://api.resy.com/3/venuesearch/search"
-    all_reservations = []
+
+    key = cache_key(cuisine, day, party_size, target_time)
+    cached = load_cached_reservations(key, day, cache_mode)
+    if cached is not None:
+        return cached
+    if cache_mode == "replay":
+        print(f"ℹ️ No cached reservations for {cuisine} (replay mode).")
+        return empty_reservations()
 
     for attempt in range(1, MAX_RETRIES + 1):
+        # One list per column (one entry per slot); the frame is built once at the end.
+        # Reset per attempt so a retried cuisine doesn't append its rows twice.
+        venue_names, neighborhoods, ratings, total_ratings_list = [], [], [], []
+        price_ranges, cuisine_types, dates, times = [], [], [], []
+        dining_types, links, latitudes, longitudes, icon_images = [], [], [], [], []
+
         payload = {
             "availability": True,
             "page": 1,
@@ -52,171 +287,294 @@ def fetch_cuisine_reservations(cuisine, day, party_size, target_time):
                 payload["slot_filter"]["time_filter"] = target_time_24h
             except ValueError:
                 print(f"⚠️ Invalid time format: {target_time}. Expected format: HH:MM AM/PM")
-                return []
+                return empty_reservations()
 
         try:
-            response = requests.post(url, json=payload, headers=HEADERS, timeout=10)
+            response = post_search(url, payload)
 
-            if response.status_code == 502:
-                print(f"⚠️ 502 Bad Gateway for {cuisine}. Retrying... ({attempt}/{MAX_RETRIES})")
-                time.sleep(min(RETRY_DELAY) + (attempt * 1))  # Increase delay per attempt
+            if response.status_code in (429, 502):
+                print(f"⚠️ {response.status_code} from API for {cuisine}. Retrying... ({attempt}/{MAX_RETRIES})")
+                if attempt < MAX_RETRIES:  # No point waiting before giving up
+                    time.sleep(backoff_delay(attempt, response))
                 continue  # Retry request
 
+            if not isinstance(cuisine, str) and 400 <= response.status_code < 500:
+                # The API rejected the list-valued cuisine filter; query each cuisine on its own
+                print(f"⚠️ API Error {response.status_code} for batch {cuisine}; falling back to one request per cuisine.")
+                results = [
+                    fetch_cuisine_reservations(c, day, party_size, target_time, cache_mode) for c in cuisine
+                ]
+                results = [r for r in results if not r.empty]
+                return pd.concat(results, ignore_index=True) if results else empty_reservations()
+
             if response.status_code != 200:
                 print(f"❌ API Error {response.status_code} for {cuisine}: {response.text}")
-                return []  # Skip cuisine if the API is failing
+                return empty_reservations()  # Skip cuisine if the API is failing
 
             try:
-                data = response.json()
-            except ValueError:
+                data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
                 print(f"⚠️ Invalid JSON response for {cuisine}. Skipping...")
-                return []  # If JSON decoding fails, skip
+                return empty_reservations()  # If JSON decoding fails, skip
 
             if "meta" not in data or "search" not in data:
                 print(f"⚠️ Unexpected API structure for {cuisine}: {data}")
-                return []
+                return empty_reservations()
 
-            total_pages = min(10, int(data["meta"].get("total_pages", 0)))
+            available_pages = int(data["meta"].get("total_pages", 0))
+            total_pages = min(MAX_PAGES, available_pages)
+            if available_pages > MAX_PAGES:
+                print(f"⚠️ {cuisine} has {available_pages} pages; only the first {MAX_PAGES} are fetched.")
 
             if total_pages == 0:
                 print(f"ℹ️ No reservations found for {cuisine}.")
-                return []
-
-            for page in range(1, total_pages + 1):
-                payload["page"] = page
-                response = requests.post(url, json=payload, headers=HEADERS)
+                all_reservations = empty_reservations()
+                if cache_mode == "enabled":
+                    store_cached_reservations(key, day, all_reservations)
+                return all_reservations
+
+            results = data  # Page 1 was already fetched by the probe request above
+
+            # Fan the remaining pages out in parallel, unless page 1 was already short (the last one)
+            complete = True  # Only cache results where every page decoded cleanly
+            page_futures = {}
+            if len(data["search"].get("hits", [])) >= payload["per_page"]:
+                page_futures = {
+                    page: PAGE_POOL.submit(post_search, url, {**payload, "page": page})
+                    for page in range(2, total_pages + 1)
+                }
+
+            for page in [1, *page_futures]:
+                if page > 1:
+                    try:
+                        response = page_futures[page].result()
+                        if response.status_code != 200:
+                            raise requests.exceptions.HTTPError(
+                                f"{response.status_code} on page {page}", response=response
+                            )
+                    except requests.exceptions.RequestException:
+                        for future in page_futures.values():
+                            future.cancel()  # Don't spend tokens on the rest of a failed attempt
+                        raise  # Retry the whole cuisine below
 
-                try:
-                    results = response.json()
-                except ValueError:
-                    print(f"⚠️ Skipping invalid JSON response for {cuisine} page {page}.")
-                    continue
+                    try:
+                        results = orjson.loads(response.content)
+                    except orjson.JSONDecodeError:
+                        print(f"⚠️ Skipping invalid JSON response for {cuisine} page {page}.")
+                        complete = False
+                        continue
 
                 if "search" not in results or "hits" not in results["search"]:
+                    complete = False
                     continue
 
-                for restaurant in results["search"]["hits"]:
+                hits = results["search"]["hits"]
+                for restaurant in hits:
                     venue_name = restaurant["name"]
                     neighborhood = restaurant["neighborhood"].strip()
                     slug = restaurant['url_slug']
-                    rating = restaurant.get("rating", {}).get("average", "N/A")
-                    total_ratings = restaurant.get("rating", {}).get("count", "N/A")
+                    rating = restaurant.get("rating", {}).get("average")  # None (NaN) keeps the column numeric
+                    total_ratings = restaurant.get("rating", {}).get("count")
                     price_range = restaurant.get("price_range_id", 0)
                     cuisine_type = restaurant.get("cuisine", ["Unknown"])[0]
                     latitude = restaurant["_geoloc"]["lat"]
                     longitude = restaurant["_geoloc"]["lng"]
 
-                    try:
-                        icon_image = restaurant["images"][0]
-                    except:
-                        icon_image = 'https://img.freepik.com/premium-vector/cartoon-orange_24381-186.jpg'
+                    images = restaurant.get("images") or ()
+                    icon_image = images[0] if images else FALLBACK_IMAGE
 
+                    link = f"https://resy.com/cities/new-york-ny/venues/{slug}?date={day}&seats={party_size}"
                     for slot in restaurant.get("availability", {}).get("slots", []):
-                        reservation_dt = NY_TZ.localize(datetime.strptime(slot["date"]["start"], "%Y-%m-%d %H:%M:%S"))
-
-                        all_reservations.append({
-                            "Venue Name": venue_name,
-                            "Neighborhood": neighborhood,
-                            "Rating": rating,
-                            "Total Ratings": total_ratings,
-                            "Price Range": "$" * price_range,
-                            "Cuisine Type": cuisine_type,
-                            "Date": reservation_dt.strftime("%Y-%m-%d"),
-                            "Time (NYC)": reservation_dt.strftime("%I:%M %p"),
-                            "Table Size": party_size,
-                            "Dining Type": slot["config"]["type"],
-                            "Reservation Link": f"https://resy.com/cities/new-york-ny/venues/{slug}?date={day}&seats={party_size}",
-                            "Latitude": latitude,
-                            "Longitude": longitude,
-                            "Icon Image": icon_image
-                        })
-
+                        venue_names.append(venue_name)
+                        neighborhoods.append(neighborhood)
+                        ratings.append(rating)
+                        total_ratings_list.append(total_ratings)
+                        price_ranges.append("$" * price_range)
+                        cuisine_types.append(cuisine_type)
+                        start = slot["date"]["start"]  # Naive NYC wall-clock time
+                        dates.append(start[:10])
+                        times.append(format_slot_time(start))
+                        dining_types.append(slot["config"]["type"])
+                        links.append(link)
+                        latitudes.append(latitude)
+                        longitudes.append(longitude)
+                        icon_images.append(icon_image)
+
+            all_reservations = pd.DataFrame({
+                "Venue Name": venue_names,
+                "Neighborhood": neighborhoods,
+                "Rating": ratings,
+                "Total Ratings": total_ratings_list,
+                "Price Range": price_ranges,
+                "Cuisine Type": cuisine_types,
+                "Date": dates,
+                "Time (NYC)": times,
+                "Table Size": party_size,
+                "Dining Type": dining_types,
+                "Reservation Link": links,
+                "Latitude": latitudes,
+                "Longitude": longitudes,
+                "Icon Image": icon_images
+            }, columns=RESERVATION_COLUMNS)
+
+            if cache_mode == "enabled" and complete:
+                store_cached_reservations(key, day, all_reservations)
             return all_reservations  # Return results if successful
 
         except requests.exceptions.RequestException as e:
-            print(f"⚠️ Network error for {cuisine}: {e}. Retrying ({attempt}/{MAX_RETRIES})")
-            time.sleep(min(RETRY_DELAY) + (attempt * 1))  # Increase delay per attempt
+            print(f"⚠️ Request error for {cuisine}: {e}. Retrying ({attempt}/{MAX_RETRIES})")
+            if attempt < MAX_RETRIES:
+                time.sleep(backoff_delay(attempt, e.response))
 
     print(f"🚫 Giving up on {cuisine} after {MAX_RETRIES} attempts.")
-    return []  # Return empty list if all retries fail
+    return empty_reservations()  # Return empty frame if all retries fail
 
-def fetch_available_reservations(day, party_size, target_time=None):
+def fetch_available_reservations(day, party_size, target_time=None, max_workers=None, cache_mode=CACHE_MODE, batch_size=None):
     """Fetch reservations for all cuisines concurrently with better error handling."""
     all_reservations = []
+    if max_workers is None:
+        max_workers = DEFAULT_CONCURRENCY
+    max_workers = max(1, max_workers)
+    if batch_size is None:
+        batch_size = CUISINE_BATCH_SIZE
+
+    if batch_size > 0:
+        queries = [CUISINES[i:i + batch_size] for i in range(0, len(CUISINES), batch_size)]
+    else:
+        queries = CUISINES
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:  # Reduce max_workers to avoid API blocks
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {
-            executor.submit(fetch_cuisine_reservations, cuisine, day, party_size, target_time): cuisine
-            for cuisine in CUISINES
+            executor.submit(fetch_cuisine_reservations, cuisine, day, party_size, target_time, cache_mode): cuisine
+            for cuisine in queries
         }
 
         for future in concurrent.futures.as_completed(futures):
             try:
                 result = future.result()
-                all_reservations.extend(result)
+                if not result.empty:
+                    all_reservations.append(result)
             except Exception as e:
                 print(f"⚠️ Error fetching reservations for {futures[future]}: {e}")
 
+    log_request_latency()
+
     if not all_reservations:
         print("🚫 No reservations found for any cuisine!")
 
-    return pd.DataFrame(all_reservations).drop_duplicates(subset=['Reservation Link'])
+        return empty_reservations()
+
+    df = pd.concat(all_reservations, ignore_index=True)
+    df.drop_duplicates(subset=['Reservation Link'], keep='first', ignore_index=True, inplace=True)
+    return df
+
+def serialize_results(df):
+    """Encode a results frame as base64 zstd-compressed Parquet for dcc.Store."""
+    # Parquet needs one type per column; coerce any stray non-numeric ratings to NaN
+    df = df.assign(**{col: pd.to_numeric(df[col], errors="coerce") for col in ("Rating", "Total Ratings")})
+    buf = io.BytesIO()
+    df.to_parquet(buf, compression='zstd')
+    return base64.b64encode(buf.getvalue()).decode()
+
+def deserialize_results(data):
+    """Decode a results frame previously encoded with serialize_results."""
+    return pd.read_parquet(io.BytesIO(base64.b64decode(data)))
+
+def filter_options(series):
+    """Build sorted dropdown options from the distinct values of a column."""
+    return [{"label": v, "value": v} for v in sorted(pd.unique(series.dropna()))]
+
+# Recently generated tiles keyed by results content hash, so repeated filters are free
+TILE_CACHE = collections.OrderedDict()
+TILE_CACHE_SIZE = 32
+TILE_CACHE_LOCK = threading.Lock()
+
+def results_key(df_results):
+    """Hash the contents of a results frame (ignoring the index)."""
+    return hashlib.sha256(pd.util.hash_pandas_object(df_results, index=False).values.tobytes()).hexdigest()
 
 def generate_tiles(df_results):
+    """Return the result tiles for a frame, reusing them if the same rows were rendered recently."""
+    key = results_key(df_results)
+    with TILE_CACHE_LOCK:
+        if key in TILE_CACHE:
+            TILE_CACHE.move_to_end(key)
+            return TILE_CACHE[key]
+
+    tiles = build_tiles(df_results)
+
+    with TILE_CACHE_LOCK:
+        TILE_CACHE[key] = tiles
+        if len(TILE_CACHE) > TILE_CACHE_SIZE:
+            TILE_CACHE.popitem(last=False)
+    return tiles
+
+# Tile styles are shared by every tile; Dash copies props when serializing, so reuse is safe
+TILE_STYLE = {
+    'border': '1px solid #FF5722', 'borderRadius': '10px', 'padding': '10px',
+    'margin': '10px', 'width': '260px', 'backgroundColor': '#FFFFFF',
+    'boxShadow': '0px 4px 8px rgba(0, 0, 0, 0.2)', 'textAlign': 'center',
+    'position': 'relative'
+}
+TILE_TITLE_STYLE = {'color': '#FF5722', 'margin': '0px', 'fontSize': '16px'}
+TILE_TITLE_WRAPPER_STYLE = {'textAlign': 'center', 'marginBottom': '5px'}
+TILE_PRICE_STYLE = {
+    'position': 'absolute', 'top': '10px', 'right': '10px',
+    'color': 'green', 'fontSize': '16px', 'fontWeight': 'bold'
+}
+TILE_IMAGE_STYLE = {'width': '100%', 'height': '120px', 'objectFit': 'cover', 'borderRadius': '10px'}
+TILE_RATING_STYLE = {'color': '#FFC107', 'fontSize': '14px', 'fontWeight': 'bold', 'marginRight': '5px'}
+TILE_RATING_COUNT_STYLE = {'color': 'blue', 'fontSize': '14px', 'fontWeight': 'bold'}
+TILE_RATING_ROW_STYLE = {'marginTop': '5px'}
+TILE_DETAILS_STYLE = {'fontWeight': 'bold', 'marginTop': '10px'}
+TILE_BUTTON_STYLE = {
+    'backgroundColor': '#FF5722', 'color': 'white', 'border': 'none',
+    'padding': '8px 15px', 'borderRadius': '5px', 'cursor': 'pointer',
+    'fontSize': '14px', 'marginTop': '10px', 'width': '100%'
+}
+
+def build_tiles(df_results):
     tiles = []
-    for _, row in df_results.iterrows():
-        formatted_time = row['Time (NYC)']
+    rows = zip(
+        df_results['Venue Name'].to_numpy(), df_results['Rating'].to_numpy(),
+        df_results['Total Ratings'].to_numpy(), df_results['Price Range'].to_numpy(),
+        df_results['Time (NYC)'].to_numpy(), df_results['Icon Image'].to_numpy(),
+        df_results['Neighborhood'].to_numpy(), df_results['Cuisine Type'].to_numpy(),
+        df_results['Reservation Link'].to_numpy()
+    )
+    for venue_name, rating, total_ratings, price_range, formatted_time, icon_image, neighborhood, cuisine_type, link in rows:
         reservation_text = f"Reserve - {formatted_time}"
 
-        avg_rating = round(float(row['Rating']), 2) if pd.notna(row['Rating']) else 0.00
-        total_ratings = int(row['Total Ratings']) if pd.notna(row['Total Ratings']) else 0
-        price_range = row['Price Range']
+        avg_rating = round(float(rating), 2) if pd.notna(rating) else 0.00
+        total_ratings = int(total_ratings) if pd.notna(total_ratings) else 0
 
         tile = html.Div(
-            style={
-                'border': '1px solid #FF5722', 'borderRadius': '10px', 'padding': '10px',
-                'margin': '10px', 'width': '260px', 'backgroundColor': '#FFFFFF',
-                'boxShadow': '0px 4px 8px rgba(0, 0, 0, 0.2)', 'textAlign': 'center',
-                'position': 'relative'
-            },
+            style=TILE_STYLE,
             children=[
                 # ✅ Title (Centered)
                 html.Div([
-                    html.H3(row["Venue Name"], style={'color': '#FF5722', 'margin': '0px', 'fontSize': '16px'}),
-                ], style={'textAlign': 'center', 'marginBottom': '5px'}),
+                    html.H3(venue_name, style=TILE_TITLE_STYLE),
+                ], style=TILE_TITLE_WRAPPER_STYLE),
 
                 # ✅ Price in Top Right Corner
-                html.Div(
-                    price_range,
-                    style={
-                        'position': 'absolute', 'top': '10px', 'right': '10px',
-                        'color': 'green', 'fontSize': '16px', 'fontWeight': 'bold'
-                    }
-                ),
+                html.Div(price_range, style=TILE_PRICE_STYLE),
 
                 # ✅ Restaurant Image (Smaller)
-                html.Img(
-                    src=row['Icon Image'],
-                    style={'width': '100%', 'height': '120px', 'objectFit': 'cover', 'borderRadius': '10px'}
-                ),
+                html.Img(src=icon_image, style=TILE_IMAGE_STYLE),
 
                 # ✅ Rating & Total Reviews (Same Line)
                 html.Div([
-                    html.Span(f"⭐ {avg_rating}", style={'color': '#FFC107', 'fontSize': '14px', 'fontWeight': 'bold', 'marginRight': '5px'}),
-                    html.Span(f"({total_ratings})", style={'color': 'blue', 'fontSize': '14px', 'fontWeight': 'bold'}),
-                ], style={'marginTop': '5px'}),
+                    html.Span(f"⭐ {avg_rating}", style=TILE_RATING_STYLE),
+                    html.Span(f"({total_ratings})", style=TILE_RATING_COUNT_STYLE),
+                ], style=TILE_RATING_ROW_STYLE),
 
                 # ✅ Neighborhood & Cuisine Type
-                html.P(f"{row['Neighborhood']} | {row['Cuisine Type']}", style={'fontWeight': 'bold', 'marginTop': '10px'}),
+                html.P(f"{neighborhood} | {cuisine_type}", style=TILE_DETAILS_STYLE),
 
                 # ✅ Reservation Button
                 html.A(
-                    html.Button(reservation_text, style={
-                        'backgroundColor': '#FF5722', 'color': 'white', 'border': 'none',
-                        'padding': '8px 15px', 'borderRadius': '5px', 'cursor': 'pointer',
-                        'fontSize': '14px', 'marginTop': '10px', 'width': '100%'
-                    }),
-                    href=row["Reservation Link"], target="_blank"
+                    html.Button(reservation_text, style=TILE_BUTTON_STYLE),
+                    href=link, target="_blank"
                 )
             ]
         )
@@ -390,7 +748,9 @@ app.layout = html.Div(style={
 def update_results(search_clicks, filter_clicks, stored_data, date, time_input, party_size, price_filter, cuisine_filter, location_filter):
     ctx = dash.callback_context
     if not ctx.triggered:
-        return None, [], [], [], [], "Total Results: 0", "Unique Restaurants: 0", [], ""
+        # Everything except the counters still holds its initial (empty) value
+        no_update = dash.no_update
+        return no_update, no_update, no_update, no_update, no_update, "Total Results: 0", "Unique Restaurants: 0", no_update, no_update
 
     triggered_id = ctx.triggered[0]["prop_id"].split(".")[0]
 
@@ -400,42 +760,61 @@ def update_results(search_clicks, filter_clicks, stored_data, date, time_input,
     if triggered_id == "search_button" or stored_data is None:
         print("🔄 Fetching fresh data from API...")
         df_results = fetch_available_reservations(date, party_size, time_input)
-        stored_data = df_results.to_json()
+
+        # Dropdown options cover the unfiltered results, so compute them once per search
+        stored_data = {
+            "df": serialize_results(df_results),
+            "price_opts": filter_options(df_results["Price Range"]),
+            "cuisine_opts": filter_options(df_results["Cuisine Type"]),
+            "loc_opts": filter_options(df_results["Neighborhood"])
+        }
+        price_options = stored_data["price_opts"]
+        cuisine_options = stored_data["cuisine_opts"]
+        location_options = stored_data["loc_opts"]
+
+        # ✅ Remove loading message once data is fetched
+        loading_message = ""
     else:
         print("✅ Using cached data...")
-        df_results = pd.read_json(stored_data)
+        df_results = deserialize_results(stored_data["df"])
 
-    # ✅ Remove loading message once data is fetched
-    loading_message = ""
+        # Store, dropdown options and loading message don't change on filter clicks
+        stored_data = price_options = cuisine_options = location_options = dash.no_update
+        loading_message = dash.no_update
 
     # Apply filters if Apply Filters button is clicked
     if triggered_id == "filter_button":
+        # Combine all filters into one mask so only a single filtered frame is allocated
+        mask = np.ones(len(df_results), dtype=bool)
         if price_filter:
-            df_results = df_results[df_results["Price Range"].isin(price_filter)]
+            mask &= df_results["Price Range"].isin(price_filter).to_numpy()
         if cuisine_filter:
-            df_results = df_results[df_results["Cuisine Type"].isin(cuisine_filter)]
+            mask &= df_results["Cuisine Type"].isin(cuisine_filter).to_numpy()
         if location_filter:
-            df_results = df_results[df_results["Neighborhood"].isin(location_filter)]
+            mask &= df_results["Neighborhood"].isin(location_filter).to_numpy()
+        df_results = df_results.loc[mask]
 
     # Handle empty results
     if df_results.empty:
-        return stored_data, [html.P("No results found.", style={'textAlign': 'center', 'color': 'red'})], [], [], [], "Total Results: 0", "Unique Restaurants: 0", [], ""
+        return stored_data, [html.P("No results found.", style={'textAlign': 'center', 'color': 'red'})], price_options, cuisine_options, location_options, "Total Results: 0", "Unique Restaurants: 0", [], loading_message
 
     # Generate UI Tiles
     tiles = generate_tiles(df_results)
 
     # Generate Map Markers
-    markers = [
-        dl.Marker(
-            position=[row["Latitude"], row["Longitude"]],
-            children=[dl.Tooltip(row["Venue Name"])]
-        ) for _, row in df_results.iterrows()
+    # Rows are already one per venue link (fetch_available_reservations dedups on it), so one marker per row
+    lats = df_results["Latitude"].to_numpy()
+    lons = df_results["Longitude"].to_numpy()
+    names = df_results["Venue Name"].to_numpy()
+    # A single clustered GeoJSON layer instead of one React component per marker
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lo, la]},
+            "properties": {"name": n, "tooltip": n}
+        } for la, lo, n in zip(lats, lons, names)
     ]
-
-    # Update dropdown options dynamically
-    price_options = [{"label": p, "value": p} for p in sorted(df_results["Price Range"].unique())]
-    cuisine_options = [{"label": c, "value": c} for c in sorted(df_results["Cuisine Type"].unique())]
-    location_options = [{"label": l, "value": l} for l in sorted(df_results["Neighborhood"].unique())]
+    markers = [dl.GeoJSON(data={"type": "FeatureCollection", "features": features}, cluster=True)]
 
     total_reservations = len(df_results)
     unique_restaurants = df_results["Venue Name"].nunique()